@@ -11,20 +11,26 @@ import (
 const EmailAddress = "joao.castropinheiro@gmail.com"
 
 type Config struct {
-	Feeds            []string `yaml:"feeds"`
+	Feeds []string `yaml:"feeds"`
+	// When a feed has at least this many unsent items in one cycle, they
+	// are coalesced into a single digest email.
+	DigestThreshold int `yaml:"digest_threshold"`
+	// Skip TLS certificate verification when fetching feeds.
+	InsecureTLS      bool `yaml:"insecure_tls"`
 	GmailAppPassword string
 }
 
 func Load(configPath string) (*Config, error) {
 	_ = godotenv.Load()
 
-	data, err := os.ReadFile(configPath)
+	f, err := os.Open(configPath)
 	if err != nil {
 		return nil, fmt.Errorf("failed to read config file: %w", err)
 	}
+	defer f.Close()
 
 	var cfg Config
-	if err := yaml.Unmarshal(data, &cfg); err != nil {
+	if err := yaml.NewDecoder(f).Decode(&cfg); err != nil {
 		return nil, fmt.Errorf("failed to parse config file: %w", err)
 	}
 
@@ -38,5 +44,9 @@ func Load(configPath string) (*Config, error) {
 		return nil, fmt.Errorf("no feeds configured in config.yaml")
 	}
 
+	if cfg.DigestThreshold == 0 {
+		cfg.DigestThreshold = 5
+	}
+
 	return &cfg, nil
 }
@@ -5,6 +5,7 @@ import (
 	"fmt"
 	"os"
 	"path/filepath"
+	"sync"
 	"time"
 
 	_ "modernc.org/sqlite"
@@ -12,6 +13,52 @@ import (
 
 var db *sql.DB
 
+var stmtMarkItemSent *sql.Stmt
+
+// The full sent-items set easily fits in memory (a few MB for tens of
+// thousands of rows), so membership checks are served from these maps
+// and SQLite is only the durable write-through log. Guarded by sentMu
+// because feeds are processed concurrently.
+var (
+	sentMu    sync.Mutex
+	sentItems map[string]bool
+	sentFeeds map[string]bool
+)
+
+func sentKey(feedURL, itemGUID string) string {
+	return feedURL + "\x00" + itemGUID
+}
+
+func loadSentItems() error {
+	sentItems = make(map[string]bool)
+	sentFeeds = make(map[string]bool)
+
+	rows, err := db.Query("SELECT feed_url, item_guid FROM sent_items")
+	if err != nil {
+		return fmt.Errorf("failed to load sent items: %w", err)
+	}
+	defer rows.Close()
+
+	for rows.Next() {
+		var feedURL, guid string
+		if err := rows.Scan(&feedURL, &guid); err != nil {
+			return fmt.Errorf("failed to scan sent item: %w", err)
+		}
+		sentItems[sentKey(feedURL, guid)] = true
+		sentFeeds[feedURL] = true
+	}
+	return rows.Err()
+}
+
+func rememberSent(feedURL string, itemGUIDs ...string) {
+	sentMu.Lock()
+	defer sentMu.Unlock()
+	for _, guid := range itemGUIDs {
+		sentItems[sentKey(feedURL, guid)] = true
+	}
+	sentFeeds[feedURL] = true
+}
+
 func Initialize(dbPath string) error {
 	dataDir := filepath.Dir(dbPath)
 	if err := os.MkdirAll(dataDir, 0755); err != nil {
@@ -24,6 +71,17 @@ func Initialize(dbPath string) error {
 		return fmt.Errorf("failed to open database: %w", err)
 	}
 
+	// WAL avoids an fsync per insert; NORMAL is durable enough for a
+	// resendable sent-items log.
+	pragmas := `
+	PRAGMA journal_mode=WAL;
+	PRAGMA synchronous=NORMAL;
+	PRAGMA temp_store=MEMORY;
+	`
+	if _, err := db.Exec(pragmas); err != nil {
+		return fmt.Errorf("failed to set pragmas: %w", err)
+	}
+
 	schema := `
 	CREATE TABLE IF NOT EXISTS sent_items (
 		id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,45 +97,95 @@ func Initialize(dbPath string) error {
 		last_checked TIMESTAMP NOT NULL,
 		last_poll_status INTEGER,
 		next_check_after TIMESTAMP,
-		error_count INTEGER DEFAULT 0
+		error_count INTEGER DEFAULT 0,
+		last_guid TEXT
 	);
-	CREATE INDEX IF NOT EXISTS idx_feed_guid ON sent_items(feed_url, item_guid);
+	DROP INDEX IF EXISTS idx_feed_guid;
 	`
 
 	if _, err := db.Exec(schema); err != nil {
 		return fmt.Errorf("failed to create schema: %w", err)
 	}
 
+	// Databases created before last_guid existed need the column added;
+	// on fresh databases this fails with "duplicate column" and is ignored.
+	_, _ = db.Exec("ALTER TABLE feed_metadata ADD COLUMN last_guid TEXT")
+
+	if err := prepareStatements(); err != nil {
+		return err
+	}
+
+	if err := loadSentItems(); err != nil {
+		return err
+	}
+
 	return nil
 }
 
-func IsItemSent(feedURL, itemGUID string) (bool, error) {
-	var count int
-	query := "SELECT COUNT(*) FROM sent_items WHERE feed_url = ? AND item_guid = ?"
-	err := db.QueryRow(query, feedURL, itemGUID).Scan(&count)
+func prepareStatements() error {
+	var err error
+	stmtMarkItemSent, err = db.Prepare("INSERT OR IGNORE INTO sent_items (feed_url, item_guid, sent_at) VALUES (?, ?, ?)")
 	if err != nil {
-		return false, fmt.Errorf("failed to check if item is sent: %w", err)
+		return fmt.Errorf("failed to prepare statement: %w", err)
 	}
-	return count > 0, nil
+	return nil
 }
 
 func MarkItemSent(feedURL, itemGUID string) error {
-	query := "INSERT OR IGNORE INTO sent_items (feed_url, item_guid, sent_at) VALUES (?, ?, ?)"
-	_, err := db.Exec(query, feedURL, itemGUID, time.Now())
+	_, err := stmtMarkItemSent.Exec(feedURL, itemGUID, time.Now().UTC())
 	if err != nil {
 		return fmt.Errorf("failed to mark item as sent: %w", err)
 	}
+	rememberSent(feedURL, itemGUID)
 	return nil
 }
 
-func HasFeedItems(feedURL string) (bool, error) {
-	var count int
-	query := "SELECT COUNT(*) FROM sent_items WHERE feed_url = ?"
-	err := db.QueryRow(query, feedURL).Scan(&count)
+func GetSentGUIDs(feedURL string, itemGUIDs []string) map[string]bool {
+	sent := make(map[string]bool, len(itemGUIDs))
+	sentMu.Lock()
+	defer sentMu.Unlock()
+	for _, guid := range itemGUIDs {
+		if sentItems[sentKey(feedURL, guid)] {
+			sent[guid] = true
+		}
+	}
+	return sent
+}
+
+func MarkItemsSent(feedURL string, itemGUIDs []string) error {
+	if len(itemGUIDs) == 0 {
+		return nil
+	}
+
+	tx, err := db.Begin()
 	if err != nil {
-		return false, fmt.Errorf("failed to check if feed has items: %w", err)
+		return fmt.Errorf("failed to begin transaction: %w", err)
+	}
+	defer tx.Rollback()
+
+	stmt := tx.Stmt(stmtMarkItemSent)
+	defer stmt.Close()
+
+	// One timestamp for the whole batch; UTC so sent_at is unambiguous
+	// across DST changes.
+	now := time.Now().UTC()
+	for _, guid := range itemGUIDs {
+		if _, err := stmt.Exec(feedURL, guid, now); err != nil {
+			return fmt.Errorf("failed to mark item as sent: %w", err)
+		}
 	}
-	return count > 0, nil
+
+	if err := tx.Commit(); err != nil {
+		return fmt.Errorf("failed to commit transaction: %w", err)
+	}
+	rememberSent(feedURL, itemGUIDs...)
+	return nil
+}
+
+func HasFeedItems(feedURL string) bool {
+	sentMu.Lock()
+	defer sentMu.Unlock()
+	return sentFeeds[feedURL]
 }
 
 type FeedMetadata struct {
@@ -87,12 +195,14 @@ type FeedMetadata struct {
 	LastPollStatus int
 	NextCheckAfter *time.Time
 	ErrorCount     int
+	LastGUID       string
 }
 
 func GetFeedMetadata(feedURL string) (*FeedMetadata, error) {
 	var metadata FeedMetadata
-	query := `SELECT COALESCE(last_modified, ''), COALESCE(etag, ''), 
-	          last_checked, COALESCE(last_poll_status, 0), next_check_after, COALESCE(error_count, 0)
+	query := `SELECT COALESCE(last_modified, ''), COALESCE(etag, ''),
+	          last_checked, COALESCE(last_poll_status, 0), next_check_after, COALESCE(error_count, 0),
+	          COALESCE(last_guid, '')
 	          FROM feed_metadata WHERE feed_url = ?`
 
 	err := db.QueryRow(query, feedURL).Scan(
@@ -102,6 +212,7 @@ func GetFeedMetadata(feedURL string) (*FeedMetadata, error) {
 		&metadata.LastPollStatus,
 		&metadata.NextCheckAfter,
 		&metadata.ErrorCount,
+		&metadata.LastGUID,
 	)
 
 	if err == sql.ErrNoRows {
@@ -133,6 +244,14 @@ func UpsertFeedMetadata(feedURL, lastModified, etag string, pollStatus, errorCou
 	return nil
 }
 
+func UpdateFeedHead(feedURL, lastGUID string) error {
+	_, err := db.Exec("UPDATE feed_metadata SET last_guid = ? WHERE feed_url = ?", lastGUID, feedURL)
+	if err != nil {
+		return fmt.Errorf("failed to update feed head: %w", err)
+	}
+	return nil
+}
+
 func Close() error {
 	if db != nil {
 		return db.Close()
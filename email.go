@@ -3,6 +3,10 @@ package main
 import (
 	"fmt"
 	"net/smtp"
+	"strings"
+	"sync"
+	"text/template"
+	"time"
 
 	"github.com/jordan-wright/email"
 )
@@ -10,9 +14,66 @@ import (
 const (
 	smtpServer = "smtp.gmail.com"
 	smtpPort   = "587"
+
+	sendTimeout = 30 * time.Second
+
+	// Feed workers send concurrently; a few pooled connections let their
+	// sends overlap instead of serializing on a single SMTP session.
+	smtpPoolSize = 4
+
+	publishedLayout = "2006-01-02 15:04:05"
 )
 
-func SendEmail(gmailAppPassword, subject, textBody, htmlBody string) error {
+var pool *email.Pool
+
+func OpenEmailPool(gmailAppPassword string) error {
+	auth := smtp.PlainAuth("", EmailAddress, gmailAppPassword, smtpServer)
+	p, err := email.NewPool(smtpServer+":"+smtpPort, smtpPoolSize, auth)
+	if err != nil {
+		return fmt.Errorf("failed to open SMTP pool: %w", err)
+	}
+	pool = p
+	return nil
+}
+
+func CloseEmailPool() {
+	if pool != nil {
+		pool.Close()
+		pool = nil
+	}
+}
+
+// Courtesy pacing towards Gmail: only block when a burst exceeds
+// maxSendsPerSecond, instead of an unconditional sleep per message.
+const maxSendsPerSecond = 10
+
+var (
+	sendMu    sync.Mutex
+	sendTimes []time.Time
+)
+
+func pace() {
+	sendMu.Lock()
+	defer sendMu.Unlock()
+
+	for {
+		cutoff := time.Now().Add(-time.Second)
+		i := 0
+		for i < len(sendTimes) && sendTimes[i].Before(cutoff) {
+			i++
+		}
+		sendTimes = sendTimes[i:]
+		if len(sendTimes) < maxSendsPerSecond {
+			break
+		}
+		time.Sleep(time.Until(sendTimes[0].Add(time.Second)))
+	}
+	sendTimes = append(sendTimes, time.Now())
+}
+
+func SendEmail(subject, textBody, htmlBody string) error {
+	pace()
+
 	e := email.NewEmail()
 	e.From = EmailAddress
 	e.To = []string{EmailAddress}
@@ -20,57 +81,110 @@ func SendEmail(gmailAppPassword, subject, textBody, htmlBody string) error {
 	e.Text = []byte(textBody)
 	e.HTML = []byte(htmlBody)
 
-	auth := smtp.PlainAuth("", EmailAddress, gmailAppPassword, smtpServer)
-	addr := smtpServer + ":" + smtpPort
-
-	if err := e.Send(addr, auth); err != nil {
-		return fmt.Errorf("failed to send email: %w", err)
+	if err := pool.Send(e, sendTimeout); err != nil {
+		// The server may have dropped the pooled connection between sends;
+		// the pool reconnects on the next attempt.
+		if err := pool.Send(e, sendTimeout); err != nil {
+			return fmt.Errorf("failed to send email: %w", err)
+		}
 	}
 
 	return nil
 }
 
-func FormatRSSEmail(feedName string, item FeedItem) (subject, textBody, htmlBody string) {
-	subject = fmt.Sprintf("[RSS] %s: %s", feedName, item.Title)
-
-	published := "Unknown"
-	if item.Published != nil {
-		published = item.Published.Format("2006-01-02 15:04:05")
-	}
+type emailData struct {
+	FeedName  string
+	Title     string
+	Link      string
+	Published string
+	Summary   string
+}
 
-	textBody = fmt.Sprintf(`
-New post from %s
+// text/template for both bodies: the summary is feed-provided HTML that
+// must be embedded verbatim, so html/template's escaping would mangle it.
+var (
+	textTmpl = template.Must(template.New("text").Parse(`
+New post from {{.FeedName}}
 
-Title: %s
-Link: %s
-Published: %s
+Title: {{.Title}}
+Link: {{.Link}}
+Published: {{.Published}}
 
-%s
+{{.Summary}}
 
 ---
 This email was sent by RSS to Email service.
-`, feedName, item.Title, item.Link, published, item.Summary)
+`))
 
-	htmlBody = fmt.Sprintf(`
+	htmlTmpl = template.Must(template.New("html").Parse(`
 <html>
 <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-    <h2 style="color: #2c3e50;">New post from %s</h2>
-    
+    <h2 style="color: #2c3e50;">New post from {{.FeedName}}</h2>
+
     <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0;">
         <h3 style="margin-top: 0;">
-            <a href="%s" style="color: #2980b9; text-decoration: none;">
-                %s
+            <a href="{{.Link}}" style="color: #2980b9; text-decoration: none;">
+                {{.Title}}
             </a>
         </h3>
         <p style="color: #7f8c8d; font-size: 0.9em;">
-            <strong>Published:</strong> %s
+            <strong>Published:</strong> {{.Published}}
         </p>
     </div>
-    
+
     <div style="margin: 20px 0;">
-        %s
+        {{.Summary}}
+    </div>
+
+    <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ecf0f1;">
+        <p style="color: #95a5a6; font-size: 0.85em;">
+            This email was sent by RSS to Email service.
+        </p>
     </div>
-    
+</body>
+</html>
+`))
+)
+
+type digestData struct {
+	FeedName string
+	Items    []emailData
+}
+
+var (
+	textDigestTmpl = template.Must(template.New("textDigest").Parse(`
+{{len .Items}} new posts from {{.FeedName}}
+{{range .Items}}
+Title: {{.Title}}
+Link: {{.Link}}
+Published: {{.Published}}
+
+{{.Summary}}
+
+---
+{{end}}
+This email was sent by RSS to Email service.
+`))
+
+	htmlDigestTmpl = template.Must(template.New("htmlDigest").Parse(`
+<html>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+    <h2 style="color: #2c3e50;">{{len .Items}} new posts from {{.FeedName}}</h2>
+{{range .Items}}
+    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0;">
+        <h3 style="margin-top: 0;">
+            <a href="{{.Link}}" style="color: #2980b9; text-decoration: none;">
+                {{.Title}}
+            </a>
+        </h3>
+        <p style="color: #7f8c8d; font-size: 0.9em;">
+            <strong>Published:</strong> {{.Published}}
+        </p>
+        <div style="margin: 10px 0;">
+            {{.Summary}}
+        </div>
+    </div>
+{{end}}
     <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ecf0f1;">
         <p style="color: #95a5a6; font-size: 0.85em;">
             This email was sent by RSS to Email service.
@@ -78,7 +192,52 @@ This email was sent by RSS to Email service.
     </div>
 </body>
 </html>
-`, feedName, item.Link, item.Title, published, item.Summary)
+`))
+)
+
+func FormatRSSDigest(feedName string, items []FeedItem) (subject, textBody, htmlBody string) {
+	subject = fmt.Sprintf("[RSS] %s: %d new posts", feedName, len(items))
+
+	data := digestData{FeedName: feedName, Items: make([]emailData, 0, len(items))}
+	for _, item := range items {
+		published := "Unknown"
+		if item.Published != nil {
+			published = item.Published.Format(publishedLayout)
+		}
+		data.Items = append(data.Items, emailData{
+			Title:     item.Title,
+			Link:      item.Link,
+			Published: published,
+			Summary:   item.Summary,
+		})
+	}
+
+	var text, html strings.Builder
+	_ = textDigestTmpl.Execute(&text, data)
+	_ = htmlDigestTmpl.Execute(&html, data)
+
+	return subject, text.String(), html.String()
+}
+
+func FormatRSSEmail(feedName string, item FeedItem) (subject, textBody, htmlBody string) {
+	subject = fmt.Sprintf("[RSS] %s: %s", feedName, item.Title)
+
+	published := "Unknown"
+	if item.Published != nil {
+		published = item.Published.Format(publishedLayout)
+	}
+
+	data := emailData{
+		FeedName:  feedName,
+		Title:     item.Title,
+		Link:      item.Link,
+		Published: published,
+		Summary:   item.Summary,
+	}
+
+	var text, html strings.Builder
+	_ = textTmpl.Execute(&text, data)
+	_ = htmlTmpl.Execute(&html, data)
 
-	return subject, textBody, htmlBody
+	return subject, text.String(), html.String()
 }
@@ -8,6 +8,7 @@ import (
 	"os"
 	"os/signal"
 	"strconv"
+	"sync"
 	"syscall"
 	"time"
 )
@@ -16,6 +17,9 @@ var cfg *Config
 
 const StandardInterval = 60 * time.Minute
 
+// How many feeds are fetched and processed at once.
+const fetchConcurrency = 20
+
 func main() {
 	logger, err := NewMonthlyLogger("data/logs")
 	if err != nil {
@@ -29,37 +33,56 @@ func main() {
 		log.Fatalf("Failed to load configuration: %v", err)
 	}
 
+	if cfg.InsecureTLS {
+		AllowInsecureTLS()
+	}
+
 	if err := Initialize("data/rss_email.db"); err != nil {
 		log.Fatalf("Failed to initialize database: %v", err)
 	}
 	defer Close()
 
-	checkFeeds()
+	if err := OpenEmailPool(cfg.GmailAppPassword); err != nil {
+		log.Fatalf("Failed to open SMTP connection pool: %v", err)
+	}
+	defer CloseEmailPool()
 
-	go func() {
-		ticker := time.NewTicker(StandardInterval)
-		defer ticker.Stop()
+	sigChan := make(chan os.Signal, 1)
+	signal.Notify(sigChan, os.Interrupt, syscall.SIGTERM)
 
-		for range ticker.C {
-			checkFeeds()
-		}
-	}()
+	checkFeeds()
 
-	log.Printf("Scheduler started - checking feeds every %v", StandardInterval)
+	ticker := time.NewTicker(StandardInterval)
+	defer ticker.Stop()
 
-	sigChan := make(chan os.Signal, 1)
-	signal.Notify(sigChan, os.Interrupt, syscall.SIGTERM)
-	<-sigChan
+	log.Printf("Scheduler started - checking feeds every %v", StandardInterval)
 
-	log.Println("Shutting down...")
+	for {
+		select {
+		case <-ticker.C:
+			checkFeeds()
+		case <-sigChan:
+			log.Println("Shutting down...")
+			return
+		}
+	}
 }
 
 func checkFeeds() {
 	log.Println("Checking feeds...")
 
+	var wg sync.WaitGroup
+	sem := make(chan struct{}, fetchConcurrency)
 	for _, feedURL := range cfg.Feeds {
-		processFeed(feedURL)
+		wg.Add(1)
+		sem <- struct{}{}
+		go func() {
+			defer wg.Done()
+			defer func() { <-sem }()
+			processFeed(feedURL)
+		}()
 	}
+	wg.Wait()
 
 	log.Println("Done checking feeds.")
 }
@@ -120,17 +143,26 @@ func processFeed(feedURL string) {
 		return
 	}
 
-	hasFeedItems, err := HasFeedItems(feedURL)
-	if err != nil {
-		log.Printf("Error checking feed items for %s: %v", feedURL, err)
+	// Unchanged head item means nothing new: skip the per-item work
+	// (GUID lookups, formatting) entirely.
+	headGUID := result.Items[0].GUID
+	if metadata != nil && headGUID != "" && headGUID == metadata.LastGUID {
 		return
 	}
 
-	if hasFeedItems {
+	if HasFeedItems(feedURL) {
 		processExistingFeed(feedURL, result.FeedTitle, result.Items)
 	} else {
 		processNewFeed(feedURL, result.FeedTitle, result.Items)
 	}
+
+	// Only remember the head once the items have been processed, so a
+	// failed cycle is retried rather than skipped next time.
+	if headGUID != "" {
+		if err := UpdateFeedHead(feedURL, headGUID); err != nil {
+			log.Printf("Error updating feed head for %s: %v", feedURL, err)
+		}
+	}
 }
 
 func processNewFeed(feedURL, feedName string, items []FeedItem) {
@@ -141,33 +173,66 @@ func processNewFeed(feedURL, feedName string, items []FeedItem) {
 
 	sendItem(feedURL, feedName, *mostRecent)
 
+	guids := make([]string, 0, len(items))
 	for _, item := range items {
 		if item.GUID != mostRecent.GUID {
-			if err := MarkItemSent(feedURL, item.GUID); err != nil {
-				log.Printf("Error marking item as sent: %v", err)
-			}
+			guids = append(guids, item.GUID)
 		}
 	}
+	if err := MarkItemsSent(feedURL, guids); err != nil {
+		log.Printf("Error marking items as sent: %v", err)
+	}
 }
 
 func processExistingFeed(feedURL, feedName string, items []FeedItem) {
+	guids := make([]string, 0, len(items))
 	for _, item := range items {
-		isSent, err := IsItemSent(feedURL, item.GUID)
-		if err != nil {
-			log.Printf("Error checking if item is sent: %v", err)
-			continue
-		}
+		guids = append(guids, item.GUID)
+	}
 
-		if !isSent {
-			sendItem(feedURL, feedName, item)
+	sentGUIDs := GetSentGUIDs(feedURL, guids)
+
+	unsent := make([]FeedItem, 0, len(items))
+	for _, item := range items {
+		if !sentGUIDs[item.GUID] {
+			unsent = append(unsent, item)
 		}
 	}
+
+	if len(unsent) >= cfg.DigestThreshold {
+		sendDigest(feedURL, feedName, unsent)
+		return
+	}
+
+	for _, item := range unsent {
+		sendItem(feedURL, feedName, item)
+	}
+}
+
+func sendDigest(feedURL, feedName string, items []FeedItem) {
+	subject, textBody, htmlBody := FormatRSSDigest(feedName, items)
+
+	if err := SendEmail(subject, textBody, htmlBody); err != nil {
+		log.Printf("Error sending digest for %s: %v", feedURL, err)
+		return
+	}
+
+	guids := make([]string, 0, len(items))
+	for _, item := range items {
+		guids = append(guids, item.GUID)
+	}
+	if err := MarkItemsSent(feedURL, guids); err != nil {
+		log.Printf("Error marking items as sent: %v", err)
+		return
+	}
+
+	log.Printf("Sent digest of %d items for %s", len(items), feedURL)
 }
 
 func sendItem(feedURL, feedName string, item FeedItem) {
 	subject, textBody, htmlBody := FormatRSSEmail(feedName, item)
 
-	if err := SendEmail(cfg.GmailAppPassword, subject, textBody, htmlBody); err != nil {
+	if err := SendEmail(subject, textBody, htmlBody); err != nil {
 		log.Printf("Error sending email for %s: %v", item.Title, err)
 		return
 	}
@@ -178,8 +243,6 @@ func sendItem(feedURL, feedName string, item FeedItem) {
 	}
 
 	log.Printf("Sent: %s for %s", item.Title, feedURL)
-
-	time.Sleep(1 * time.Second) // Rate limiting
 }
 
 func calculateBackoff(status int, retryAfter string, errorCount int) time.Time {